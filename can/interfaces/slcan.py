@@ -2,11 +2,15 @@
 Interface for slcan compatible interfaces (win32/linux).
 """
 
+import binascii
+import collections
 import io
 import logging
+import os
+import select
 import time
 import warnings
-from typing import Any, Optional, Tuple, Union
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
 
 from can import BitTiming, BitTimingFd, BusABC, CanProtocol, Message, typechecking
 from can.exceptions import (
@@ -29,30 +33,132 @@ except ImportError:
     serial = None
 
 
+# CAN FD data lengths indexed by their DLC nibble and the reverse mapping
+_DLC_DECODE = (0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64)
+_DLC_ENCODE = {length: f"{dlc:X}" for dlc, length in enumerate(_DLC_DECODE)}
+_DLC_ENCODE_BYTES = {length: code.encode() for length, code in _DLC_ENCODE.items()}
+
+
+# CAN FD data lengths indexed by the ASCII code of their DLC character,
+# invalid characters decode to 64
+_DLC_BYTE_TABLE = bytes(
+    _DLC_DECODE[int(chr(i), 16)] if chr(i) in "0123456789abcdefABCDEF" else 64
+    for i in range(256)
+)
+
+
+def _decode_hex_dlc(hex_dlc: str) -> int:
+    try:
+        return _DLC_BYTE_TABLE[ord(hex_dlc)]
+    except (TypeError, IndexError):
+        return 64
+
+
+# (arbitration id, dlc, data, is_extended_id, is_remote_frame, is_fd, bitrate_switch)
+_FrameFields = Tuple[int, int, Optional[bytes], bool, bool, bool, bool]
+
+
+def _parse_std(frame: bytes) -> _FrameFields:
+    # normal frame
+    dlc = int(frame[4:5])
+    data = binascii.unhexlify(frame[5 : 5 + dlc * 2])
+    return int(frame[1:4], 16), dlc, data, False, False, False, False
+
+
+def _parse_ext(frame: bytes) -> _FrameFields:
+    # extended frame
+    dlc = int(frame[9:10])
+    data = binascii.unhexlify(frame[10 : 10 + dlc * 2])
+    return int(frame[1:9], 16), dlc, data, True, False, False, False
+
+
+def _parse_rem_std(frame: bytes) -> _FrameFields:
+    # remote frame
+    return int(frame[1:4], 16), int(frame[4:5]), None, False, True, False, False
+
+
+def _parse_rem_ext(frame: bytes) -> _FrameFields:
+    # remote extended frame
+    return int(frame[1:9], 16), int(frame[9:10]), None, True, True, False, False
+
+
+def _parse_fd_std(frame: bytes) -> _FrameFields:
+    # Standard CAN FD data frame
+    dlc = _DLC_BYTE_TABLE[frame[4]]
+    data = binascii.unhexlify(frame[5 : 5 + dlc * 2])
+    return int(frame[1:4], 16), dlc, data, False, False, True, False
+
+
+def _parse_fd_ext(frame: bytes) -> _FrameFields:
+    # Extended CAN FD data frame
+    dlc = _DLC_BYTE_TABLE[frame[9]]
+    data = binascii.unhexlify(frame[10 : 10 + dlc * 2])
+    return int(frame[1:9], 16), dlc, data, True, False, True, False
+
+
+def _parse_fdbrs_std(frame: bytes) -> _FrameFields:
+    # CANFD Flexible Data Frame
+    dlc = _DLC_BYTE_TABLE[frame[4]]
+    data = binascii.unhexlify(frame[5 : 5 + dlc * 2])
+    return int(frame[1:4], 16), dlc, data, False, False, True, True
+
+
+def _parse_fdbrs_ext(frame: bytes) -> _FrameFields:
+    # Extended CANFD Flexible Data Frame
+    dlc = _DLC_BYTE_TABLE[frame[9]]
+    data = binascii.unhexlify(frame[10 : 10 + dlc * 2])
+    return int(frame[1:9], 16), dlc, data, True, False, True, True
+
+
 class slcanBus(BusABC):
     """
     slcan interface
     """
 
-    # the supported bitrates and their commands
+    # the supported bitrates and their (terminated) commands
     _BITRATES = {
-        10000: "S0",
-        20000: "S1",
-        50000: "S2",
-        100000: "S3",
-        125000: "S4",
-        250000: "S5",
-        500000: "S6",
-        750000: "S7",
-        1000000: "S8",
-        83300: "S9",
+        10000: b"S0\r",
+        20000: b"S1\r",
+        50000: b"S2\r",
+        100000: b"S3\r",
+        125000: b"S4\r",
+        250000: b"S5\r",
+        500000: b"S6\r",
+        750000: b"S7\r",
+        1000000: b"S8\r",
+        83300: b"S9\r",
+    }
+
+    # received frame parsers keyed by the first byte of the frame
+    _FRAME_PARSERS: Dict[int, Callable[[bytes], _FrameFields]] = {
+        ord("T"): _parse_ext,
+        # x is an alternative extended message identifier for CANDapter
+        ord("x"): _parse_ext,
+        ord("t"): _parse_std,
+        ord("r"): _parse_rem_std,
+        ord("R"): _parse_rem_ext,
+        ord("d"): _parse_fd_std,
+        ord("D"): _parse_fd_ext,
+        ord("b"): _parse_fdbrs_std,
+        ord("B"): _parse_fdbrs_ext,
     }
 
     _SLEEP_AFTER_SERIAL_OPEN = 2  # in seconds
 
+    # preencoded (terminated) commands to open and close the channel
+    _OPEN = b"O\r"
+    _OPEN_LISTEN = b"L\r"
+    _CLOSE = b"C\r"
+
     _OK = b"\r"
     _ERROR = b"\a"
 
+    # initial capacity of the receive buffer, it only grows for oversized input
+    _RX_BUFFER_SIZE = 16384  # in bytes
+
+    # maximum number of bytes fetched from the serial device per read
+    _RX_CHUNK_SIZE = 8192  # in bytes
+
     LINE_TERMINATOR = b"\r"
 
     @deprecated_args_alias(
@@ -130,8 +236,29 @@ class slcanBus(BusABC):
                 rtscts=rtscts,
                 timeout=timeout,
             )
-
-        self._buffer = bytearray()
+        # on POSIX the receive path reads the file descriptor of the device directly,
+        # unless the handler hooks into reading (e.g. spy:// logs received data)
+        self._fd: Optional[int] = None
+        if os.name == "posix" and type(self.serialPortOrig).read is serial.Serial.read:
+            self._fd = self.serialPortOrig.fileno()
+            os.set_blocking(self._fd, False)
+
+        self._ser_write = self.serialPortOrig.write
+        self._ser_flush = self.serialPortOrig.flush
+
+        # read and write timeouts currently configured on the serial device
+        self._rx_timeout: Optional[float] = timeout
+        # bound for a single blocking read while waiting for a finite time
+        self._poll_timeout = timeout if timeout else 0.001
+        self._tx_timeout: Optional[float] = self.serialPortOrig.write_timeout
+        # received data occupies self._buffer[self._read_pos : self._buf_len]
+        self._buffer = bytearray(self._RX_BUFFER_SIZE)
+        self._buf_len = 0
+        self._read_pos = 0
+        # complete frames split off the receive buffer but not consumed yet
+        self._frame_queue: Deque[bytes] = collections.deque()
+        # time at which the last data was read from the device
+        self._rx_timestamp = 0.0
         self._can_protocol = CanProtocol.CAN_20
 
         time.sleep(sleep_after_open)
@@ -177,7 +304,7 @@ class slcanBus(BusABC):
             raise ValueError(f"Invalid bitrate, choose one of {bitrates}.")
 
         self.close()
-        self._write(bitrate_code)
+        self._write_bytes(bitrate_code)
         self.open()
 
     def set_bitrate_reg(self, btr: str) -> None:
@@ -191,202 +318,208 @@ class slcanBus(BusABC):
         self.open()
 
     def _write(self, string: str) -> None:
+        self._write_bytes(string.encode("ascii") + self.LINE_TERMINATOR)
+
+    def _write_bytes(self, data: Union[bytes, bytearray]) -> None:
         with error_check("Could not write to serial device"):
-            self.serialPortOrig.write(string.encode() + self.LINE_TERMINATOR)
-            self.serialPortOrig.flush()
+            self._ser_write(data)
+            self._ser_flush()
+
+    def _read(self, timeout: Optional[float]) -> Optional[bytes]:
+        if self._frame_queue:
+            return self._frame_queue.popleft()
 
-    def _read(self, timeout: Optional[float]) -> Optional[str]:
         _timeout = serial.Timeout(timeout)
 
         with error_check("Could not read from serial device"):
-            while not _timeout.expired():
-                ok_index = self._buffer.find(self._OK)
-                error_index = self._buffer.find(self._ERROR)
-                if error_index != -1 or ok_index != -1:
-                    first_marker_index = (
-                        min(idx for idx in [error_index, ok_index] if idx != -1)
-                    )
-
-                    string = self._buffer[: first_marker_index + 1].decode()
-                    self._buffer = bytearray(self._buffer[first_marker_index + 1 :])
-                    return string
-                # Due to accessing `serialPortOrig.in_waiting` too often will reduce the performance.
-                # We read the `serialPortOrig.in_waiting` only once here.
-                in_waiting = self.serialPortOrig.in_waiting
-                if in_waiting > 0:
-                    new_bytes = self.serialPortOrig.read(size=in_waiting)
-                    self._buffer.extend(new_bytes)
+            expired = False
+            while True:
+                self._split_frames()
+                if self._frame_queue:
+                    return self._frame_queue.popleft()
+
+                # scan the buffer once more after the last read before giving up
+                if expired:
+                    break
+
+                if self._fd is not None:
+                    received = self._read_fd(_timeout.time_left())
                 else:
-                    time.sleep(0.001)
+                    received = self._read_serial(_timeout.time_left())
+                if received:
+                    # all frames completed by this read share its arrival time
+                    self._rx_timestamp = time.time()
+
+                expired = _timeout.expired()
 
         return None
 
+    def _split_frames(self) -> None:
+        # move every complete frame in the receive buffer to the frame queue
+        buffer = self._buffer
+        read_pos = self._read_pos
+        buf_len = self._buf_len
+        # frames are copied out of a view, slicing the bytearray would copy twice
+        with memoryview(buffer) as view:
+            while True:
+                # an error marker only matters if it precedes the first OK marker,
+                # so the second scan stops there
+                ok_index = buffer.find(self._OK, read_pos, buf_len)
+                if ok_index == -1:
+                    error_index = buffer.find(self._ERROR, read_pos, buf_len)
+                else:
+                    error_index = buffer.find(self._ERROR, read_pos, ok_index)
+                first_marker_index = error_index if error_index != -1 else ok_index
+                if first_marker_index == -1:
+                    break
+                self._frame_queue.append(bytes(view[read_pos : first_marker_index + 1]))
+                read_pos = first_marker_index + 1
+
+        if read_pos == buf_len:
+            self._buf_len = read_pos = 0
+        elif read_pos > len(buffer) // 2:
+            self._compact(read_pos)
+            read_pos = 0
+        self._read_pos = read_pos
+
+    def _compact(self, read_pos: int) -> None:
+        # move the unconsumed data to the start of the receive buffer
+        remaining = self._buf_len - read_pos
+        self._buffer[:remaining] = self._buffer[read_pos : self._buf_len]
+        self._buf_len = remaining
+
+    def _reserve(self, size: int) -> None:
+        # make room for at least `size` bytes after the received data
+        if self._buf_len + size <= len(self._buffer):
+            return
+        if self._read_pos:
+            self._compact(self._read_pos)
+            self._read_pos = 0
+        if self._buf_len + size > len(self._buffer):
+            self._buffer.extend(bytes(max(len(self._buffer), size)))
+
+    def _read_fd(self, time_left: Optional[float]) -> int:
+        # wait for input on the file descriptor directly, bypassing pyserial,
+        # and return the number of bytes read into the receive buffer
+        ready, _, _ = select.select([self._fd], [], [], time_left)
+        if not ready:
+            return 0
+        self._reserve(self._RX_CHUNK_SIZE)
+        buf_len = self._buf_len
+        try:
+            with memoryview(self._buffer) as view:
+                n = os.readv(self._fd, [view[buf_len : buf_len + self._RX_CHUNK_SIZE]])
+        except BlockingIOError:
+            return 0
+        if not n:
+            raise serial.SerialException(
+                "device reports readiness to read but returned no data "
+                "(device disconnected or multiple access on port?)"
+            )
+        self._buf_len += n
+        return n
+
+    def _read_serial(self, time_left: Optional[float]) -> int:
+        # return the number of bytes read into the receive buffer
+        received = 0
+        # Due to accessing `serialPortOrig.in_waiting` too often will reduce the performance.
+        # We read the `serialPortOrig.in_waiting` only once here.
+        in_waiting = self.serialPortOrig.in_waiting
+        if in_waiting == 0:
+            # block in the OS until the next byte arrives, finite waits are bounded
+            # by the poll timeout and the loop in _read() enforces the remainder.
+            # Every change of the timeout reconfigures the port, so it is only
+            # shortened when less than the poll timeout is left.
+            if time_left is None:
+                rx_timeout = None
+            else:
+                rx_timeout = min(time_left, self._poll_timeout)
+            if rx_timeout != self._rx_timeout:
+                self.serialPortOrig.timeout = rx_timeout
+                self._rx_timeout = rx_timeout
+            first_byte = self.serialPortOrig.read(1)
+            if first_byte:
+                self._reserve(1)
+                self._buffer[self._buf_len] = first_byte[0]
+                self._buf_len += 1
+                received = 1
+                in_waiting = self.serialPortOrig.in_waiting
+        if in_waiting > 0:
+            size = min(in_waiting, self._RX_CHUNK_SIZE)
+            self._reserve(size)
+            buf_len = self._buf_len
+            with memoryview(self._buffer) as view:
+                n = self.serialPortOrig.readinto(view[buf_len : buf_len + size])
+            if n:
+                self._buf_len += n
+                received += n
+        return received
+
     def flush(self) -> None:
-        self._buffer.clear()
+        self._buf_len = self._read_pos = 0
+        self._frame_queue.clear()
         with error_check("Could not flush"):
             self.serialPortOrig.reset_input_buffer()
 
     def open(self) -> None:
-        if self._listen_only:
-            self._write("L")
-        else:
-            self._write("O")
+        self._write_bytes(self._OPEN_LISTEN if self._listen_only else self._OPEN)
 
     def close(self) -> None:
-        self._write("C")
+        self._write_bytes(self._CLOSE)
 
     def decode_hex_dlc(self, hex_dlc: str) -> int:
-        hex_dlc = hex_dlc.upper()
-        if hex_dlc.isdigit():
-            num = int(hex_dlc)
-            if 0 <= num <= 8:
-                return num
-            elif num == 9:
-                return 12
-        elif hex_dlc == 'A':
-            return 16
-        elif hex_dlc == 'B':
-            return 20
-        elif hex_dlc == 'C':
-            return 24
-        elif hex_dlc == 'D':
-            return 32
-        elif hex_dlc == 'E':
-            return 48
-        return 64
+        return _decode_hex_dlc(hex_dlc)
 
     def _recv_internal(
         self, timeout: Optional[float]
     ) -> Tuple[Optional[Message], bool]:
-        canId = None
-        remote = False
-        extended = False
-        is_fd = False
-        bitrate_switch = False
-        data = None
-
         string = self._read(timeout)
-
         if not string:
-            pass
-        elif string[0] in (
-            "T",
-            "x",  # x is an alternative extended message identifier for CANDapter
-        ):
-            # extended frame
-            canId = int(string[1:9], 16)
-            dlc = int(string[9])
-            extended = True
-            data = bytearray.fromhex(string[10 : 10 + dlc * 2])
-        elif string[0] == "t":
-            # normal frame
-            canId = int(string[1:4], 16)
-            dlc = int(string[4])
-            data = bytearray.fromhex(string[5 : 5 + dlc * 2])
-        elif string[0] == "r":
-            # remote frame
-            canId = int(string[1:4], 16)
-            dlc = int(string[4])
-            remote = True
-        elif string[0] == "R":
-            # remote extended frame
-            canId = int(string[1:9], 16)
-            dlc = int(string[9])
-            extended = True
-            remote = True
-        elif string[0] == "d":
-            # Standard CAN FD data frame
-            canId = int(string[1:4], 16)
-            dlc = self.decode_hex_dlc(string[4])
-            data = bytearray.fromhex(string[5 : 5 + dlc * 2])
-            is_fd = True
-        elif string[0] == "D":
-            # Extended CAN FD data frame
-            canId = int(string[1:9], 16)
-            dlc = self.decode_hex_dlc(string[9])
-            data = bytearray.fromhex(string[10 : 10 + dlc * 2])
-            extended = True
-            is_fd = True
-        elif string[0] == "b":
-            # CANFD Flexible Data Frame
-            canId = int(string[1:4], 16)
-            dlc = self.decode_hex_dlc(string[4])
-            data = bytearray.fromhex(string[5 : 5 + dlc * 2])
-            is_fd = True
-            bitrate_switch = True
-        elif string[0] == "B":
-            # Extended CANFD Flexible Data Frame
-            canId = int(string[1:9], 16)
-            dlc = self.decode_hex_dlc(string[9])
-            data = bytearray.fromhex(string[10 : 10 + dlc * 2])
-            is_fd = True
-            bitrate_switch = True
-            extended = True
-
-        if canId is not None:
-            msg = Message(
-                arbitration_id=canId,
-                is_extended_id=extended,
-                timestamp=time.time(),  # Better than nothing...
-                is_remote_frame=remote,
-                is_fd=is_fd,
-                bitrate_switch=bitrate_switch,
-                dlc=dlc,
-                data=data,
-            )
-            return msg, False
-        return None, False
+            return None, False
+
+        parser = self._FRAME_PARSERS.get(string[0])
+        if parser is None:
+            return None, False
+
+        canId, dlc, data, extended, remote, is_fd, bitrate_switch = parser(string)
+        msg = Message(
+            arbitration_id=canId,
+            is_extended_id=extended,
+            timestamp=self._rx_timestamp,  # Better than nothing...
+            is_remote_frame=remote,
+            is_fd=is_fd,
+            bitrate_switch=bitrate_switch,
+            dlc=dlc,
+            data=data,
+        )
+        return msg, False
 
     def encode_dlc_hex(self, data_length: int) -> str:
-        if 0 <= data_length <= 8:
-            return format(data_length, 'X')
-        elif data_length == 12:
-            return '9'
-        elif data_length == 16:
-            return 'A'
-        elif data_length == 20:
-            return 'B'
-        elif data_length == 24:
-            return 'C'
-        elif data_length == 32:
-            return 'D'
-        elif data_length == 48:
-            return 'E'
-        return 'F'
+        return _DLC_ENCODE.get(data_length, "F")
 
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
-        if timeout != self.serialPortOrig.write_timeout:
+        if timeout != self._tx_timeout:
             self.serialPortOrig.write_timeout = timeout
+            self._tx_timeout = timeout
 		
         if msg.is_fd:
-            dlc_hex = self.encode_dlc_hex(msg.dlc)
+            dlc_code = _DLC_ENCODE_BYTES.get(msg.dlc, b"F")
             if msg.bitrate_switch:
-                if msg.is_extended_id:
-                    sendStr = f"B{msg.arbitration_id:08X}{dlc_hex}"
-                else:
-                    sendStr = f"b{msg.arbitration_id:03X}{dlc_hex}"
+                header = b"B%08X%s" if msg.is_extended_id else b"b%03X%s"
             else:
-                if msg.is_extended_id:
-                    sendStr = f"D{msg.arbitration_id:08X}{dlc_hex}"
-                else:
-                    sendStr = f"d{msg.arbitration_id:03X}{dlc_hex}"
-            sendStr += msg.data.hex().upper()
-            if dlc_hex == 'F' and msg.dlc < 64:
-                padding = '00' * (64 - msg.dlc)
-                sendStr += padding
+                header = b"D%08X%s" if msg.is_extended_id else b"d%03X%s"
+            data = binascii.hexlify(msg.data).upper()
+            if dlc_code == b"F" and msg.dlc < 64:
+                data += b"00" * (64 - msg.dlc)
+            frame = header % (msg.arbitration_id, dlc_code) + data
+        elif msg.is_remote_frame:
+            header = b"R%08X%d" if msg.is_extended_id else b"r%03X%d"
+            frame = header % (msg.arbitration_id, msg.dlc)
         else:
-            if msg.is_remote_frame:
-                if msg.is_extended_id:
-                    sendStr = f"R{msg.arbitration_id:08X}{msg.dlc:d}"
-                else:
-                    sendStr = f"r{msg.arbitration_id:03X}{msg.dlc:d}"
-            else:
-                if msg.is_extended_id:
-                    sendStr = f"T{msg.arbitration_id:08X}{msg.dlc:d}"
-                else:
-                    sendStr = f"t{msg.arbitration_id:03X}{msg.dlc:d}"
-                sendStr += msg.data.hex().upper()
-        self._write(sendStr)
+            header = b"T%08X%d" if msg.is_extended_id else b"t%03X%d"
+            data = binascii.hexlify(msg.data).upper()
+            frame = header % (msg.arbitration_id, msg.dlc) + data
+        self._write_bytes(frame + self.LINE_TERMINATOR)
 
     def shutdown(self) -> None:
         super().shutdown()
@@ -424,7 +557,7 @@ class slcanBus(BusABC):
 
         if not string:
             pass
-        elif string[0] == cmd and len(string) == 6:
+        elif string[0] == ord(cmd) and len(string) == 6:
             # convert ASCII coded version
             hw_version = int(string[1:3])
             sw_version = int(string[3:5])
@@ -448,8 +581,8 @@ class slcanBus(BusABC):
 
         if not string:
             pass
-        elif string[0] == cmd and len(string) == 6:
-            serial_number = string[1:-1]
+        elif string[0] == ord(cmd) and len(string) == 6:
+            serial_number = string[1:-1].decode("ascii")
             return serial_number
 
         return None
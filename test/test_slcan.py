@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 
+import os
+import tempfile
+import time
 import unittest
 from typing import cast
+from unittest.mock import patch
 
 import serial
 
@@ -113,6 +117,57 @@ class slcanTestCase(unittest.TestCase):
         rx_msg = self.bus.recv(TIMEOUT)
         self.assertTrue(msg.equals(rx_msg, timestamp_delta=None))
 
+    def test_recv_fd(self):
+        self.serial.write(b"D12ABCDEF9" + b"A5" * 12 + b"\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x12ABCDEF)
+        self.assertEqual(msg.is_extended_id, True)
+        self.assertEqual(msg.is_fd, True)
+        self.assertEqual(msg.bitrate_switch, False)
+        self.assertEqual(msg.dlc, 12)
+        self.assertSequenceEqual(msg.data, [0xA5] * 12)
+
+        self.serial.write(b"b456F" + b"5A" * 64 + b"\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x456)
+        self.assertEqual(msg.is_extended_id, False)
+        self.assertEqual(msg.is_fd, True)
+        self.assertEqual(msg.bitrate_switch, True)
+        self.assertEqual(msg.dlc, 64)
+        self.assertSequenceEqual(msg.data, [0x5A] * 64)
+
+        # lowercase DLC character
+        self.serial.write(b"d123a" + b"00" * 16 + b"\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.dlc, 16)
+        self.assertSequenceEqual(msg.data, [0] * 16)
+
+    def test_send_fd(self):
+        msg = can.Message(
+            arbitration_id=0x12ABCDEF,
+            is_extended_id=True,
+            is_fd=True,
+            bitrate_switch=True,
+            data=range(12),
+        )
+        self.bus.send(msg)
+        rx_msg = self.bus.recv(TIMEOUT)
+        self.assertTrue(msg.equals(rx_msg, timestamp_delta=None))
+
+        # lengths without a DLC code of their own are padded to 64 bytes
+        msg = can.Message(
+            arbitration_id=0x456, is_extended_id=False, is_fd=True, data=range(10)
+        )
+        self.bus.send(msg)
+        rx_msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(rx_msg)
+        self.assertEqual(rx_msg.arbitration_id, 0x456)
+        self.assertEqual(rx_msg.dlc, 64)
+        self.assertSequenceEqual(rx_msg.data, list(range(10)) + [0] * 54)
+
     def test_partial_recv(self):
         self.serial.write(b"T12ABCDEF")
         msg = self.bus.recv(TIMEOUT)
@@ -134,6 +189,92 @@ class slcanTestCase(unittest.TestCase):
         msg = self.bus.recv(TIMEOUT)
         self.assertIsNotNone(msg)
 
+    def test_recv_after_error(self):
+        self.serial.write(b"\at4563112233\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x456)
+        self.assertSequenceEqual(msg.data, [0x11, 0x22, 0x33])
+
+    def test_recv_timestamp(self):
+        before = time.time()
+        self.serial.write(b"t4563112233\rt4563112233\r")
+        msg1 = self.bus.recv(TIMEOUT)
+        msg2 = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg1)
+        self.assertIsNotNone(msg2)
+        self.assertGreaterEqual(msg1.timestamp, before)
+        self.assertLessEqual(msg1.timestamp, time.time())
+        # both frames were read from the device at once
+        self.assertEqual(msg1.timestamp, msg2.timestamp)
+
+    def test_recv_idle_keeps_timeout(self):
+        # waiting must not reconfigure the port on every blocking read,
+        # only the last read before each deadline is shortened
+        with patch.object(
+            self.serial, "_reconfigure_port", wraps=self.serial._reconfigure_port
+        ) as reconfigure:
+            for _ in range(20):
+                msg = self.bus.recv(TIMEOUT * 5)
+                self.assertIsNone(msg)
+        self.assertLessEqual(reconfigure.call_count, 2 * 20)
+
+    def test_recv_timeout_below_poll_timeout(self):
+        bus = can.Bus("loop://", interface="slcan", sleep_after_open=0, timeout=2.0)
+        try:
+            t0 = time.perf_counter()
+            msg = bus.recv(TIMEOUT)
+            elapsed = time.perf_counter() - t0
+            self.assertIsNone(msg)
+            self.assertLess(elapsed, TIMEOUT + 0.5)
+        finally:
+            bus.shutdown()
+
+    def test_flush(self):
+        self.serial.write(b"t4563112233\rt4563112233\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+
+        # the second frame was already read from the device and is dropped as well
+        self.bus.flush()
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNone(msg)
+
+    def test_recv_many(self):
+        # enough frames to exceed the capacity of the receive buffer,
+        # written in batches since the loopback queue only holds 4096 bytes
+        frame = b"t4563112233\r"
+        batch_size = 100
+        for _ in range(2 * self.bus._RX_BUFFER_SIZE // (batch_size * len(frame))):
+            self.serial.write(frame * batch_size)
+            for _ in range(batch_size):
+                msg = self.bus.recv(TIMEOUT)
+                self.assertIsNotNone(msg)
+                self.assertEqual(msg.arbitration_id, 0x456)
+                self.assertSequenceEqual(msg.data, [0x11, 0x22, 0x33])
+
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNone(msg)
+
+    def test_recv_oversized(self):
+        # unterminated input beyond the capacity of the receive buffer,
+        # drained before each write since the loopback queue only holds 4096 bytes
+        for _ in range(2 * self.bus._RX_BUFFER_SIZE // 2000):
+            self.serial.write(b"z" * 2000)
+            while self.serial.in_waiting:
+                msg = self.bus.recv(TIMEOUT)
+                self.assertIsNone(msg)
+
+        self.serial.write(b"\rT12")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNone(msg)
+
+        self.serial.write(b"ABCDEF2AA55\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x12ABCDEF)
+        self.assertSequenceEqual(msg.data, [0xAA, 0x55])
+
     def test_version(self):
         self.serial.write(b"V1013\r")
         hw_ver, sw_ver = self.bus.get_version(0)
@@ -153,5 +294,95 @@ class slcanTestCase(unittest.TestCase):
         self.assertIsNone(sn)
 
 
+@unittest.skipUnless(os.name == "posix", "requires a pseudo terminal")
+class slcanPtyTestCase(unittest.TestCase):
+    """Exercises the POSIX receive path that reads the file descriptor directly."""
+
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.addCleanup(os.close, self.master)
+        self.addCleanup(os.close, slave)
+        self.bus = cast(
+            can.interfaces.slcan.slcanBus,
+            can.Bus(
+                os.ttyname(slave),
+                interface="slcan",
+                sleep_after_open=0,
+                timeout=TIMEOUT,
+            ),
+        )
+        self.addCleanup(self.bus.shutdown)
+
+    def test_uses_fd(self):
+        self.assertIsNotNone(self.bus._fd)
+
+    def test_recv_timestamp_after_compaction(self):
+        # a partial frame just below half the capacity, so that making room for
+        # the next read compacts the buffer by more than the read brings in
+        partial = b"T12ABCD"
+        read_pos = self.bus._RX_BUFFER_SIZE // 2 - 2
+        self.bus._buffer[read_pos : read_pos + len(partial)] = partial
+        self.bus._read_pos = read_pos
+        self.bus._buf_len = read_pos + len(partial)
+        self.bus._rx_timestamp = 1.0
+
+        before = time.time()
+        os.write(self.master, b"EF2AA55\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x12ABCDEF)
+        self.assertSequenceEqual(msg.data, [0xAA, 0x55])
+        self.assertGreaterEqual(msg.timestamp, before)
+
+    def test_spy_reads_through_pyserial(self):
+        master, slave = os.openpty()
+        self.addCleanup(os.close, master)
+        self.addCleanup(os.close, slave)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "spy.log")
+            bus = can.Bus(
+                f"spy://{os.ttyname(slave)}?file={log_path}",
+                interface="slcan",
+                sleep_after_open=0,
+                timeout=TIMEOUT,
+            )
+            try:
+                # spy:// overrides read() to log received data
+                self.assertIsNone(bus._fd)
+                os.write(master, b"t4563112233\r")
+                msg = bus.recv(TIMEOUT)
+                self.assertIsNotNone(msg)
+                self.assertEqual(msg.arbitration_id, 0x456)
+            finally:
+                bus.shutdown()
+            with open(log_path, encoding="ascii", errors="replace") as log:
+                self.assertIn("RX", log.read())
+
+    def test_recv(self):
+        os.write(self.master, b"t4563112233\rT12ABCDEF2AA55\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x456)
+        self.assertSequenceEqual(msg.data, [0x11, 0x22, 0x33])
+
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x12ABCDEF)
+        self.assertSequenceEqual(msg.data, [0xAA, 0x55])
+
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNone(msg)
+
+    def test_partial_recv(self):
+        os.write(self.master, b"T12ABCDEF")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNone(msg)
+
+        os.write(self.master, b"2AA55\r")
+        msg = self.bus.recv(TIMEOUT)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 0x12ABCDEF)
+
+
 if __name__ == "__main__":
     unittest.main()